@@ -1,52 +1,90 @@
+import functools
 import os
+import sys
+import tempfile
 from pathlib import Path
 
 AVAILABLE_TABLES = ["table5", "table6", "table7", "table8", "table9"]
 
-# Determine BASE_DIR robustly across environments (Railway Docker, local Windows)
-# Priority:
-# 1) DATA_DIR env var if provided
-# 2) BASE_DIR env var if provided (back-compat)
-# 3) Railway/Docker: /data (mounted volume)
-# 4) Legacy Docker path: /app/data
-# 5) Local Windows development: E:\ICP_notebooks\Buxton\data
-# 6) Fallback: ./data relative to project
-_env_data = os.getenv("DATA_DIR")
-_env_base = os.getenv("BASE_DIR")
-
-# Debug output
-print(f"[CONFIG DEBUG] DATA_DIR env var: {_env_data}")
-print(f"[CONFIG DEBUG] BASE_DIR env var: {_env_base}")
-print(f"[CONFIG DEBUG] /app exists: {Path('/app').exists()}")
-print(f"[CONFIG DEBUG] /data exists: {Path('/data').exists()}")
-print(f"[CONFIG DEBUG] / exists: {Path('/').exists()}")
-
-if _env_data:
-    BASE_DIR = Path(_env_data)
-    print(f"[CONFIG DEBUG] Using DATA_DIR env var: {BASE_DIR}")
-elif _env_base:
-    BASE_DIR = Path(_env_base)
-    print(f"[CONFIG DEBUG] Using BASE_DIR env var: {BASE_DIR}")
-else:
-    # Check environment-specific paths in order of preference
-    # Force /data for Railway/Docker environments
-    if Path("/app").exists() and Path("/").exists():  # Container environment (Railway/Docker)
-        BASE_DIR = Path("/data")  # Always use /data in containers
-        print(f"[CONFIG DEBUG] Container detected, using /data: {BASE_DIR}")
-    elif Path(r"E:\\ICP_notebooks\\Buxton").exists():  # Local Windows
-        BASE_DIR = Path(r"E:\\ICP_notebooks\\Buxton\\data")
-        print(f"[CONFIG DEBUG] Windows dev env: {BASE_DIR}")
+# Resolved BASE_DIR persisted across process starts; in a long-lived container
+# the answer never changes, so later cold starts read ~20 bytes instead of
+# re-probing the candidate paths.
+_BASE_DIR_SENTINEL = Path(tempfile.gettempdir()) / ".buxton_base_dir"
+
+
+@functools.lru_cache(maxsize=1)
+def get_base_dir() -> Path:
+    """Resolve the data directory once, on first access.
+
+    Priority:
+    1) DATA_DIR env var if provided
+    2) BASE_DIR env var if provided (back-compat)
+    3) Railway/Docker: /data (mounted volume)
+    4) Local Windows development: E:\\ICP_notebooks\\Buxton\\data
+    5) Fallback: ./data relative to project
+
+    Resolution (and the mkdir that goes with it) used to run at import time
+    in every Streamlit page process; caching it here defers the filesystem
+    probes to first use and runs them at most once per process.
+    """
+    _env_data = os.getenv("DATA_DIR")
+    _env_base = os.getenv("BASE_DIR")
+
+    if _env_data:
+        base_dir = Path(_env_data)
+        print(f"[CONFIG DEBUG] Using DATA_DIR env var: {base_dir}")
+    elif _env_base:
+        base_dir = Path(_env_base)
+        print(f"[CONFIG DEBUG] Using BASE_DIR env var: {base_dir}")
+    elif (cached := _read_sentinel()) is not None:
+        base_dir = cached
+        print(f"[CONFIG DEBUG] Using cached resolution: {base_dir}")
+    elif sys.platform.startswith("linux") and (
+        os.path.ismount("/data") or Path("/app").exists()
+    ):  # Container environment (Railway/Docker); /data is the mounted volume
+        base_dir = Path("/data")  # Always use /data in containers
+        print(f"[CONFIG DEBUG] Container detected, using /data: {base_dir}")
+    elif os.name == "nt" and Path(r"E:\\ICP_notebooks\\Buxton").exists():  # Local Windows
+        base_dir = Path(r"E:\\ICP_notebooks\\Buxton\\data")
+        print(f"[CONFIG DEBUG] Windows dev env: {base_dir}")
     else:
         # Local development fallback
-        BASE_DIR = Path(__file__).parent.parent / "data"
-        print(f"[CONFIG DEBUG] Local dev fallback: {BASE_DIR}")
+        base_dir = Path(__file__).parent.parent / "data"
+        print(f"[CONFIG DEBUG] Local dev fallback: {base_dir}")
+
+    # Ensure the directory exists (for uploaded data)
+    base_dir.mkdir(parents=True, exist_ok=True)
+    _write_sentinel(base_dir)
+    return base_dir
+
+
+def _read_sentinel() -> Path | None:
+    try:
+        cached = Path(_BASE_DIR_SENTINEL.read_text(encoding="utf-8").strip())
+    except OSError:
+        return None
+    # Cheap sanity check: a stale sentinel (volume remounted, tmpfs reused)
+    # must not point us at a missing directory.
+    return cached if cached.is_dir() else None
+
+
+def _write_sentinel(base_dir: Path) -> None:
+    try:
+        _BASE_DIR_SENTINEL.write_text(str(base_dir), encoding="utf-8")
+    except OSError:
+        pass  # best effort; next start just re-probes
+
 
-# Ensure BASE_DIR exists on import (for uploaded data)
-BASE_DIR.mkdir(parents=True, exist_ok=True)
+def __getattr__(name: str) -> Path:
+    # PEP 562: keep `from config import BASE_DIR` working without paying the
+    # filesystem probes on every import.
+    if name == "BASE_DIR":
+        return get_base_dir()
+    raise AttributeError(name)
 
 
 def get_table_paths(table_choice):
-    image_dir = BASE_DIR / table_choice / "sub_tables_images"
+    image_dir = get_base_dir() / table_choice / "sub_tables_images"
     pdf_dir = image_dir / "csv" / "latex"
     tsv_dir = image_dir / "csv"
     db_path = image_dir / "validation_db.json"
@@ -55,4 +93,4 @@ def get_table_paths(table_choice):
 
 def get_data_dir() -> Path:
     """Return the resolved data directory path used by the app."""
-    return BASE_DIR
+    return get_base_dir()
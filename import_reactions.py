@@ -111,13 +111,17 @@ def import_single_csv(csv_path: Path, table_no: int):
     return inserted_reactions, inserted_measurements
 
 
-def import_single_csv_idempotent(csv_path: Path, table_no: int):
+def import_single_csv_idempotent(csv_path: Path, table_no: int, con=None):
     """Idempotent import for a single CSV.
 
     - Ensures reaction exists/updated via get_or_create_reaction (one reaction per PNG by stem).
     - Replaces measurements originating from this source for that reaction.
+    - If con is provided, the caller owns the transaction and no commit is
+      issued here; bulk importers use this to batch many sources per commit.
     """
-    con = ensure_db()
+    own_con = con is None
+    if own_con:
+        con = ensure_db()
     inserted_reactions = 0
     replaced_measurements = 0
     try:
@@ -196,7 +200,8 @@ def import_single_csv_idempotent(csv_path: Path, table_no: int):
             replaced_measurements += 1
     except Exception as e:
         print(f"[IMPORT_ONE_IDEM] Error processing {csv_path}: {e}")
-    con.commit()
+    if own_con:
+        con.commit()
     return inserted_reactions, replaced_measurements
 
 
@@ -1,4 +1,3 @@
-import math
 import sys
 import time
 from pathlib import Path
@@ -457,7 +456,7 @@ with browse_tab:
                 # Pagination setup
                 PAGE_SIZE = 15
                 total = len(rows_all)
-                total_pages = max(1, math.ceil(total / PAGE_SIZE))
+                total_pages = max(1, -(-total // PAGE_SIZE))
                 # Reset page when filter changes
                 if st.session_state.get("browse_last_filter") != (name_filter or ""):
                     st.session_state.browse_page = 0
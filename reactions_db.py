@@ -579,12 +579,14 @@ def set_validated_by_source(
     *,
     by: str | None = None,
     at_iso: str | None = None,
+    commit: bool = True,
 ) -> int:
     """Set validated flag and metadata for all reactions from a given source path.
 
     Tries to match by canonical relative path; if nothing updated, falls back to filename match.
     If validated is True, set validated_by and validated_at; if False, clear them.
-    Returns number of rows updated.
+    With commit=False the caller owns the transaction (bulk importers batch
+    many of these per commit). Returns number of rows updated.
     """
     src_canon = canonicalize_source_path(source_path)
     # First try exact canonical match
@@ -613,7 +615,8 @@ def set_validated_by_source(
                 (filename,),
             )
         updated = cur.rowcount
-    con.commit()
+    if commit:
+        con.commit()
     return updated
 
 
@@ -1,9 +1,12 @@
+import itertools
 import json
-import math
+import os
 import sqlite3
 import subprocess
 import sys
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -15,14 +18,31 @@ from reactions_db import (
     ensure_db,
     get_validation_meta_by_source,
     set_validated_by_source,
+    upsert_reference,
 )
 
 CHUNK_SIZE = 50
 DB_FILE = DB_PATH
 
 
-def _safe_remove_db_files(db_path: Path, retries: int = 10, backoff_s: float = 0.2) -> None:
-    """Remove SQLite DB and sidecars with retries (Windows-friendly)."""
+def _safe_remove_db_files(db_path: Path, retries: int = 3, backoff_s: float = 0.2) -> None:
+    """Remove SQLite DB and sidecars (Windows-friendly).
+
+    Checkpointing and closing the WAL first releases the -wal/-shm sidecars
+    in the common case, so the unlinks usually succeed on the first try; a
+    short exponential backoff covers transient Windows locks (AV scanners)
+    without the seconds-long linear retry loop this used to spin through.
+    """
+    if db_path.exists():
+        try:
+            con = sqlite3.connect(str(db_path), timeout=5.0)
+            try:
+                con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                con.close()
+        except Exception:
+            pass
+
     targets = [db_path, Path(str(db_path) + "-wal"), Path(str(db_path) + "-shm")]
 
     def try_unlink(p: Path) -> None:
@@ -35,7 +55,7 @@ def _safe_remove_db_files(db_path: Path, retries: int = 10, backoff_s: float = 0
                 return
             except PermissionError as e:
                 last_err = e
-                time.sleep(backoff_s * (i + 1))
+                time.sleep(backoff_s * (2**i))
             except Exception:
                 raise
         raise PermissionError(
@@ -46,40 +66,65 @@ def _safe_remove_db_files(db_path: Path, retries: int = 10, backoff_s: float = 0
         try_unlink(t)
 
 
-def collect_sources(tables: list[str]) -> list[tuple[int, Path, dict[str, Any]]]:
+def _collect_one_table(t: str) -> list[tuple[int, Path, dict[str, Any]]]:
     sources: list[tuple[int, Path, dict[str, Any]]] = []
-    for t in tables:
-        try:
-            tno = int(t.replace("table", ""))
-        except Exception:
+    try:
+        tno = int(t.replace("table", ""))
+    except Exception:
+        return sources
+    IMAGE_DIR, PDF_DIR, TSV_DIR, DB_JSON_PATH = get_table_paths(t)
+    if not DB_JSON_PATH.exists():
+        print(f"[SKIP] {t} has no validation_db.json at {DB_JSON_PATH}")
+        return sources
+    try:
+        db = load_db(DB_JSON_PATH, IMAGE_DIR)
+    except Exception as e:
+        print(f"[WARN] Failed to load {DB_JSON_PATH}: {e}")
+        return sources
+    # Index TSV_DIR once (stem -> source path, .csv preferred over .tsv)
+    # instead of two exists() stats per image below.
+    present: dict[str, Path] = {}
+    try:
+        with os.scandir(TSV_DIR) as it:
+            for entry in it:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                if ext == ".csv" or (ext == ".tsv" and stem not in present):
+                    present[stem] = Path(entry.path)
+    except OSError:
+        pass
+    for img, meta in db.items():
+        # normalize meta
+        if isinstance(meta, bool):
+            meta = {"validated": bool(meta), "by": None, "at": None}
+        # Only include validated entries
+        if not bool(meta.get("validated", False)):
             continue
-        IMAGE_DIR, PDF_DIR, TSV_DIR, DB_JSON_PATH = get_table_paths(t)
-        if not DB_JSON_PATH.exists():
-            print(f"[SKIP] {t} has no validation_db.json at {DB_JSON_PATH}")
+        stem = Path(img).stem
+        source = present.get(stem)
+        if source is None:
+            print(f"[MISS] {t} image {img}: no TSV/CSV for '{stem}' in {TSV_DIR}")
             continue
-        try:
-            db = load_db(DB_JSON_PATH, IMAGE_DIR)
-        except Exception as e:
-            print(f"[WARN] Failed to load {DB_JSON_PATH}: {e}")
-            continue
-        for img, meta in db.items():
-            # normalize meta
-            if isinstance(meta, bool):
-                meta = {"validated": bool(meta), "by": None, "at": None}
-            # Only include validated entries
-            if not bool(meta.get("validated", False)):
-                continue
-            stem = Path(img).stem
-            csv_path = TSV_DIR / f"{stem}.csv"
-            tsv_path = TSV_DIR / f"{stem}.tsv"
-            source = csv_path if csv_path.exists() else (tsv_path if tsv_path.exists() else None)
-            if source is None:
-                print(f"[MISS] {t} image {img}: no TSV/CSV at {csv_path} or {tsv_path}")
-                continue
-            sources.append((tno, source, meta))
+        sources.append((tno, source, meta))
     return sources
 
 
+def collect_sources(tables: list[str]) -> Iterator[tuple[int, Path, dict[str, Any]]]:
+    """Yield (table_no, source, meta) per validated image without building the full list.
+
+    Tables are independent and the work per table is JSON parsing plus stat
+    calls, so a small thread pool overlaps their I/O latency; results stream
+    out in table order as each scan completes, letting the importer start on
+    the first table while later ones are still being scanned.
+    """
+    if not tables:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(tables), os.cpu_count() or 4)) as ex:
+        for table_sources in ex.map(_collect_one_table, tables):
+            yield from table_sources
+
+
 def sync_db_validation_to_json_files() -> None:
     """Sync current database validation state to validation_db.json files.
 
@@ -155,19 +200,39 @@ def rebuild_db_from_validations(chunk_size: int = CHUNK_SIZE):
         except Exception:
             pass
         cur = con.cursor()
-        tables = ["measurements", "reactions_fts", "reactions", "references_map"]
-        for tbl in tables:
-            retries = 5
-            for i in range(retries):
-                try:
-                    cur.execute(f"DELETE FROM {tbl}")
-                    break
-                except sqlite3.OperationalError as oe:
-                    if "locked" in str(oe).lower() and i < retries - 1:
-                        time.sleep(0.3 * (i + 1))
-                        continue
-                    raise
-        con.commit()
+        # Bulk-load pragmas: durability is pointless mid-rebuild (the DB is
+        # re-created from the JSON/TSV sources on failure anyway), so skip the
+        # per-commit fsyncs and give SQLite a 128 MiB page cache. Both are
+        # per-connection settings; journal_mode stays WAL for other readers.
+        for pragma in (
+            "PRAGMA synchronous = OFF",
+            "PRAGMA temp_store = MEMORY",
+            "PRAGMA cache_size = -131072",
+        ):
+            try:
+                cur.execute(pragma)
+            except Exception:
+                pass
+        # One immediate transaction clears all four tables in a single
+        # script instead of four separately prepared/committed statements.
+        clear_script = (
+            "BEGIN IMMEDIATE;"
+            "DELETE FROM measurements;"
+            "DELETE FROM reactions_fts;"
+            "DELETE FROM reactions;"
+            "DELETE FROM references_map;"
+            "COMMIT;"
+        )
+        retries = 5
+        for i in range(retries):
+            try:
+                cur.executescript(clear_script)
+                break
+            except sqlite3.OperationalError as oe:
+                if "locked" in str(oe).lower() and i < retries - 1:
+                    time.sleep(0.3 * (i + 1))
+                    continue
+                raise
     except sqlite3.DatabaseError as e:
         msg = str(e).lower()
         if "malformed" in msg or "disk image" in msg:
@@ -181,25 +246,39 @@ def rebuild_db_from_validations(chunk_size: int = CHUNK_SIZE):
         else:
             raise
 
-    tasks = collect_sources(AVAILABLE_TABLES)
-    total = len(tasks)
-    if total == 0:
-        print("[INFO] No sources discovered from validation_db.json. Nothing to import.")
-        return
+    # Drop read-path secondary indexes for the bulk load and recreate them
+    # afterwards, turning their maintenance from per-insert work into one
+    # pass over the final data. Indexes the import itself probes — png_path
+    # (unique), source_path, and the measurements composite — must stay, or
+    # every per-source lookup degrades to a table scan.
+    droppable = ("idx_reactions_validated", "idx_reactions_table_no")
+    saved_index_sql: list[str] = []
+    try:
+        for name, sql in con.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type='index' AND sql IS NOT NULL AND name IN (?, ?)",
+            droppable,
+        ).fetchall():
+            saved_index_sql.append(sql)
+            con.execute(f"DROP INDEX IF EXISTS {name}")
+        con.commit()
+    except Exception as e:
+        print(f"[WARN] Could not drop secondary indexes: {e}")
 
-    chunks = math.ceil(total / chunk_size)
+    # Stream sources straight into the importer: no up-front "count first"
+    # pass, and the task list never sits fully in memory.
+    source_iter = iter(collect_sources(AVAILABLE_TABLES))
     processed = 0
-    print(f"[START] Importing {total} sources in {chunks} chunks (chunk_size={chunk_size})")
+    print(f"[START] Importing sources in chunks of {chunk_size}")
 
-    for i in range(chunks):
-        start = i * chunk_size
-        end = min(start + chunk_size, total)
-        batch = tasks[start:end]
+    while True:
+        batch = list(itertools.islice(source_iter, chunk_size))
+        if not batch:
+            break
         batch_imported = 0
         batch_validated_updates = 0
         for tno, source, meta in batch:
             try:
-                rcount, _ = import_single_csv_idempotent(source, tno)
+                rcount, _ = import_single_csv_idempotent(source, tno, con=con)
                 batch_imported += rcount or 0
             except Exception as e:
                 print(f"[ERR][IMPORT] table={tno} source={source}: {e}")
@@ -211,23 +290,43 @@ def rebuild_db_from_validations(chunk_size: int = CHUNK_SIZE):
                     bool(meta.get("validated", False)),
                     by=meta.get("by"),
                     at_iso=meta.get("at"),
+                    commit=False,
                 )
                 batch_validated_updates += updated
             except Exception as e:
                 print(f"[ERR][VALIDATE] table={tno} source={source}: {e}")
-        processed = end
-        pct = processed * 100.0 / total
+        # One fsync per chunk instead of two commits per source
+        con.commit()
+        processed += len(batch)
         print(
-            f"[PROGRESS] {processed}/{total} ({pct:.1f}%) | batch_imported={batch_imported} batch_validated_updates={batch_validated_updates}"
+            f"[PROGRESS] processed={processed} | batch_imported={batch_imported} batch_validated_updates={batch_validated_updates}"
         )
 
-    # Reindex FTS5
+    # Recreate the dropped indexes over the final data
+    try:
+        for sql in saved_index_sql:
+            con.execute(sql)
+        con.commit()
+    except Exception as e:
+        print(f"[WARN] Failed to recreate indexes: {e}")
+
+    if processed == 0:
+        print("[INFO] No sources discovered from validation_db.json. Nothing to import.")
+        return
+
+    # Reindex FTS5 and merge its b-trees; refresh planner stats
     try:
         con.execute("INSERT INTO reactions_fts(reactions_fts) VALUES('rebuild')")
+        con.execute("INSERT INTO reactions_fts(reactions_fts) VALUES('optimize')")
         con.commit()
         print("[FTS] Rebuilt reactions_fts index")
     except Exception as e:
         print(f"[FTS][WARN] Failed to rebuild FTS: {e}")
+    try:
+        con.execute("ANALYZE")
+        con.commit()
+    except Exception as e:
+        print(f"[WARN] ANALYZE failed: {e}")
 
     # Summary
     rcount = con.execute("SELECT COUNT(*) FROM reactions").fetchone()[0]
@@ -235,6 +334,227 @@ def rebuild_db_from_validations(chunk_size: int = CHUNK_SIZE):
     print(f"[DONE] Recreated DB. reactions={rcount}, measurements={mcount}")
 
 
+def _import_shard_worker(args: tuple[str, list[tuple[int, Path, dict[str, Any]]]]) -> str:
+    """Import one partition of sources into its own shard DB (worker process)."""
+    shard_path_str, part = args
+    con = ensure_db(Path(shard_path_str))
+    # Shards are throwaway scratch files; skip journaling entirely
+    for pragma in ("PRAGMA journal_mode = OFF", "PRAGMA synchronous = OFF"):
+        try:
+            con.execute(pragma)
+        except Exception:
+            pass
+    for tno, source, meta in part:
+        try:
+            import_single_csv_idempotent(source, tno, con=con)
+        except Exception as e:
+            print(f"[ERR][IMPORT] table={tno} source={source}: {e}")
+            continue
+        try:
+            set_validated_by_source(
+                con,
+                str(source),
+                bool(meta.get("validated", False)),
+                by=meta.get("by"),
+                at_iso=meta.get("at"),
+                commit=False,
+            )
+        except Exception as e:
+            print(f"[ERR][VALIDATE] table={tno} source={source}: {e}")
+    con.commit()
+    con.close()
+    return shard_path_str
+
+
+def _merge_shard(con: sqlite3.Connection, shard_path: Path) -> tuple[int, int]:
+    """Merge one shard DB into the live connection.
+
+    A plain ATTACH + INSERT..SELECT would collide: each shard allocates its
+    own AUTOINCREMENT ids and references_map enforces UNIQUE(buxton_code), so
+    reactions/measurements are re-inserted with fresh ids (each PNG lives in
+    exactly one shard, keeping png_path unique) and references go back
+    through upsert_reference for cross-shard dedup. Returns (reactions,
+    measurements) added.
+    """
+    scon = sqlite3.connect(str(shard_path))
+    scon.row_factory = sqlite3.Row
+    cur = con.cursor()
+    r_added = 0
+    m_added = 0
+    ref_map: dict[int, int | None] = {}
+
+    def map_ref(old_id: int | None) -> int | None:
+        if old_id is None:
+            return None
+        if old_id not in ref_map:
+            row = scon.execute("SELECT * FROM references_map WHERE id = ?", (old_id,)).fetchone()
+            ref_map[old_id] = (
+                upsert_reference(
+                    con, row["buxton_code"], row["citation_text"], row["doi"], row["raw_text"]
+                )
+                if row is not None
+                else None
+            )
+        return ref_map[old_id]
+
+    for r in scon.execute("SELECT * FROM reactions").fetchall():
+        cur.execute(
+            """
+            INSERT INTO reactions(
+              table_no, table_category, buxton_reaction_number, reaction_name,
+              formula_latex, formula_canonical, reactants, products,
+              reactant_species, product_species, notes, png_path, source_path,
+              validated, validated_by, validated_at
+            ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            (
+                r["table_no"],
+                r["table_category"],
+                r["buxton_reaction_number"],
+                r["reaction_name"],
+                r["formula_latex"],
+                r["formula_canonical"],
+                r["reactants"],
+                r["products"],
+                r["reactant_species"],
+                r["product_species"],
+                r["notes"],
+                r["png_path"],
+                r["source_path"],
+                r["validated"],
+                r["validated_by"],
+                r["validated_at"],
+            ),
+        )
+        new_rid = cur.lastrowid
+        r_added += 1
+        for m in scon.execute(
+            "SELECT * FROM measurements WHERE reaction_id = ?", (r["id"],)
+        ).fetchall():
+            cur.execute(
+                """
+                INSERT INTO measurements(
+                  reaction_id, pH, temperature_C, rate_value, rate_value_num,
+                  rate_units, method, conditions, reference_id, references_raw,
+                  source_path, page_info
+                ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
+                """,
+                (
+                    new_rid,
+                    m["pH"],
+                    m["temperature_C"],
+                    m["rate_value"],
+                    m["rate_value_num"],
+                    m["rate_units"],
+                    m["method"],
+                    m["conditions"],
+                    map_ref(m["reference_id"]),
+                    m["references_raw"],
+                    m["source_path"],
+                    m["page_info"],
+                ),
+            )
+            m_added += 1
+    scon.close()
+    return r_added, m_added
+
+
+def rebuild_db_parallel(n_workers: int | None = None) -> None:
+    """Rebuild the live DB with the CSV import sharded across processes.
+
+    CSV parsing plus canonicalization is CPU-bound Python, so the serial
+    rebuild leaves cores idle. Sources are partitioned round-robin across
+    worker processes, each importing into its own reactions_shard_<i>.db;
+    the coordinator then clears the live DB, merges the shards and rebuilds
+    FTS once. Falls back to the serial rebuild for tiny workloads.
+    """
+    import multiprocessing
+
+    tasks = list(collect_sources(AVAILABLE_TABLES))
+    if not tasks:
+        print("[INFO] No sources discovered from validation_db.json. Nothing to import.")
+        return
+
+    if n_workers is None:
+        n_workers = max(1, (os.cpu_count() or 2) - 1)
+    n_workers = min(n_workers, len(tasks))
+    if n_workers <= 1:
+        rebuild_db_from_validations()
+        return
+
+    shard_dir = DB_FILE.parent
+    shard_paths = [shard_dir / f"reactions_shard_{i}.db" for i in range(n_workers)]
+    for p in shard_paths:
+        _safe_remove_db_files(p)
+    partitions: list[list[tuple[int, Path, dict[str, Any]]]] = [[] for _ in range(n_workers)]
+    for i, task in enumerate(tasks):
+        partitions[i % n_workers].append(task)
+
+    print(f"[START] Importing {len(tasks)} sources across {n_workers} worker shards")
+    # Clear the live DB before the workers run, so a clear failure cannot
+    # discard hours of import work.
+    con = ensure_db()
+    try:
+        con.execute("PRAGMA busy_timeout = 5000")
+        con.execute("PRAGMA synchronous = OFF")
+    except Exception:
+        pass
+    try:
+        con.executescript(
+            "BEGIN IMMEDIATE;"
+            "DELETE FROM measurements;"
+            "DELETE FROM reactions_fts;"
+            "DELETE FROM reactions;"
+            "DELETE FROM references_map;"
+            "COMMIT;"
+        )
+    except sqlite3.DatabaseError as e:
+        # Same recovery as the serial rebuild: clearing the external-content
+        # FTS table ahead of its base table can surface as SQLITE_CORRUPT on
+        # a populated DB, and the DB may genuinely be damaged — either way a
+        # fresh file is correct since everything is re-imported below.
+        msg = str(e).lower()
+        if "malformed" in msg or "disk image" in msg:
+            print("[WARN] DB appears corrupted. Recreating reactions.db ...")
+            try:
+                _safe_remove_db_files(DB_FILE)
+            except Exception as del_err:
+                raise RuntimeError(f"Failed to remove corrupted DB: {del_err}") from del_err
+            con = ensure_db()
+        else:
+            raise
+
+    try:
+        with multiprocessing.Pool(n_workers) as pool:
+            pool.map(
+                _import_shard_worker,
+                [(str(p), part) for p, part in zip(shard_paths, partitions, strict=True)],
+            )
+
+        for p in shard_paths:
+            r_added, m_added = _merge_shard(con, p)
+            con.commit()
+            print(f"[MERGE] {p.name}: reactions={r_added} measurements={m_added}")
+
+        try:
+            con.execute("INSERT INTO reactions_fts(reactions_fts) VALUES('rebuild')")
+            con.execute("INSERT INTO reactions_fts(reactions_fts) VALUES('optimize')")
+            con.commit()
+            print("[FTS] Rebuilt reactions_fts index")
+        except Exception as e:
+            print(f"[FTS][WARN] Failed to rebuild FTS: {e}")
+
+        rcount = con.execute("SELECT COUNT(*) FROM reactions").fetchone()[0]
+        mcount = con.execute("SELECT COUNT(*) FROM measurements").fetchone()[0]
+        print(f"[DONE] Recreated DB (parallel). reactions={rcount}, measurements={mcount}")
+    finally:
+        for p in shard_paths:
+            try:
+                _safe_remove_db_files(p)
+            except Exception:
+                pass
+
+
 def build_db_offline_fast(build_path: Path = Path("reactions_build.db")) -> None:
     """Build a fresh DB offline using the fast importer into build_path.
 
@@ -257,16 +577,32 @@ def build_db_offline_fast(build_path: Path = Path("reactions_build.db")) -> None
         )
 
 
+def _replace_with_retries(src: Path, dst: Path, retries: int, backoff_s: float, what: str) -> None:
+    last_err: Exception | None = None
+    for i in range(retries):
+        try:
+            src.replace(dst)
+            return
+        except PermissionError as e:
+            last_err = e
+            time.sleep(backoff_s * (2**i))
+        except Exception:
+            raise
+    raise PermissionError(what) from last_err
+
+
 def swap_live_db(
     build_path: Path,
     live_path: Path = DB_FILE,
     backup: bool = True,
-    retries: int = 15,
+    retries: int = 5,
     backoff_s: float = 0.25,
 ) -> None:
     """Atomically replace live DB with build DB with Windows-friendly retries.
 
     Caller MUST ensure no open connections hold the live DB before calling.
+    Retries back off exponentially (capped by `retries`) instead of the old
+    linear sleep ladder.
     """
     # Best-effort: checkpoint WAL to reduce locks
     try:
@@ -295,39 +631,26 @@ def swap_live_db(
                 bak.unlink()
         except Exception:
             pass
-        last_err: Exception | None = None
-        for i in range(retries):
-            try:
-                live_path.replace(bak)
-                last_err = None
-                break
-            except PermissionError as e:
-                last_err = e
-                time.sleep(backoff_s * (i + 1))
-            except Exception:
-                raise
-        if last_err is not None:
-            raise PermissionError(
-                f"Failed to move '{live_path}' to backup '{bak}'. It appears to be in use by another process."
-            ) from last_err
+        _replace_with_retries(
+            live_path,
+            bak,
+            retries,
+            backoff_s,
+            f"Failed to move '{live_path}' to backup '{bak}'. It appears to be in use by another process.",
+        )
 
     # Move build to live with retries
-    last_err2: Exception | None = None
-    for i in range(retries):
-        try:
-            build_path.replace(live_path)
-            last_err2 = None
-            break
-        except PermissionError as e:
-            last_err2 = e
-            time.sleep(backoff_s * (i + 1))
-        except Exception:
-            raise
-    if last_err2 is not None:
-        raise PermissionError(
-            f"Failed to activate new DB '{build_path}' -> '{live_path}'. File may be locked."
-        ) from last_err2
+    _replace_with_retries(
+        build_path,
+        live_path,
+        retries,
+        backoff_s,
+        f"Failed to activate new DB '{build_path}' -> '{live_path}'. File may be locked.",
+    )
 
 
 if __name__ == "__main__":
-    rebuild_db_from_validations()
+    if "--parallel" in sys.argv[1:]:
+        rebuild_db_parallel()
+    else:
+        rebuild_db_from_validations()